@@ -1,83 +1,364 @@
-import requests
-from requests.auth import HTTPBasicAuth
+import asyncio
+import httpx
 import yaml
+import json
 import os
-import openpyxl
+import socket
+import ssl
+import ipaddress
+import time
+import pandas as pd
+import csv
 import argparse
-from datetime import datetime # Import datetime for timestamp
-
-# Disable warnings for self-signed certificates (if applicable)
-requests.packages.urllib3.disable_warnings()
+import functools
+import importlib.util
+from cachetools import TTLCache
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+from datetime import datetime, timezone # Import datetime for timestamp
+from email.utils import parsedate_to_datetime
+
+# Parse API responses with orjson (straight from bytes) when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# HTTP/2 support in httpx needs the optional 'h2' package (pip install "httpx[http2]")
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
 
 # --- Configuration ---
 # Generate a timestamp for the filename
 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S") # Format: YYYYMMDD_HHMMSS
+CSV_FILENAME = f"interface_utilization_report_{timestamp}.csv" # Each device's rows are written here as soon as it finishes
 EXCEL_FILENAME = f"interface_utilization_report_{timestamp}.xlsx" # Name of the Excel file
+REPORT_HEADERS = ["DNA Center", "Device Name", "Interface Name", "Interface Status", "Tx Utilization (%)", "Rx Utilization (%)"]
+MAX_WORKERS = 16 # Default number of concurrent API requests per DNA Center
+TOKEN_CACHE_FILE = os.path.expanduser("~/.cache/catalyst_tokens.json") # Tokens persisted between runs
+TOKEN_TTL_SECONDS = 3300 # Catalyst Center tokens are valid for 1 hour; refresh 5 minutes early
+RETRY_TOTAL = 3 # Retries for failed connections and transient HTTP errors
+RETRY_BACKOFF_FACTOR = 0.5 # Seconds; retries wait 0.5s, 1s, 2s, ...
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504} # Transient Catalyst Center responses worth retrying
+RETRY_AFTER_STATUS_CODES = {429, 503} # Responses whose Retry-After header is honoured
+RETRY_AFTER_MAX_SECONDS = 30 # Upper bound on a server-requested Retry-After wait
+UTILIZATION_CACHE_TTL_SECONDS = 30 # Repeated polls of the same interface within this window reuse the last result
+# Use the libyaml C parser when PyYAML was built with it, otherwise the pure-Python one
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# --- Configuration Models ---
+class ConfigModel(BaseModel):
+    """
+    Base for configuration models; unquoted YAML numbers (e.g. a numeric password) are accepted as strings.
+    Input values are left out of validation errors so credentials are never printed.
+    """
+    model_config = ConfigDict(coerce_numbers_to_str=True, hide_input_in_errors=True)
+
+def _none_as_empty_list(value):
+    """Treats a list key left empty in the YAML (null) as an empty list."""
+    return [] if value is None else value
+
+class DnaCenter(ConfigModel):
+    """A Catalyst Center (DNA Center) instance and its credentials."""
+    name: str
+    ip: str
+    username: str
+    password: str
+
+class DeviceEntry(ConfigModel):
+    """A device to monitor and the names of its interfaces."""
+    device_name: str
+    interfaces: list[str] = []
+
+    _interfaces_none_as_empty = field_validator('interfaces', mode='before')(_none_as_empty_list)
+
+class Target(ConfigModel):
+    """A group of devices monitored through one DNA Center, referenced by name."""
+    dna_center_name: str
+    devices: list[DeviceEntry] = []
+
+    _devices_none_as_empty = field_validator('devices', mode='before')(_none_as_empty_list)
+
+class Config(ConfigModel):
+    """The complete YAML configuration, validated once when it is loaded."""
+    dna_centers: list[DnaCenter] = []
+    targets: list[Target] = []
+
+    _lists_none_as_empty = field_validator('dna_centers', 'targets', mode='before')(_none_as_empty_list)
 
 # --- Configuration Loading Function ---
 def load_config(config_file_path):
-    """Loads configuration from a YAML file."""
+    """Loads configuration from a YAML file, reusing the parsed result until the file changes."""
     if not os.path.exists(config_file_path):
         raise FileNotFoundError(f"Configuration file '{config_file_path}' not found. Please create it.")
+    return _load_config_cached(config_file_path, os.path.getmtime(config_file_path))
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_file_path, mtime):
+    """Parses and validates a YAML configuration file; the modification time is only part of the cache key."""
     try:
         with open(config_file_path, 'r') as f:
-            config = yaml.safe_load(f)
-        return config
+            config = yaml.load(f, Loader=YAML_LOADER)
+        return Config.model_validate(config)
     except yaml.YAMLError as e:
         raise ValueError(f"Error parsing YAML configuration file: {e}")
+    except ValidationError as e:
+        raise ValueError(f"Invalid configuration file '{config_file_path}': {e}")
     except Exception as e:
         raise Exception(f"An unexpected error occurred while loading config: {e}")
 
+# --- Token Cache Functions ---
+def token_cache_key(dna_center_details):
+    """Keys cached tokens by user and DNA Center, so a changed username never reuses another user's token."""
+    return f"{dna_center_details.username}@{dna_center_details.ip}"
+
+def _is_valid_token_entry(entry, now):
+    """Checks that a persisted token entry has the expected shape and has not expired."""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get('token'), str)
+        and isinstance(entry.get('expires_at'), (int, float))
+        and entry['expires_at'] > now
+    )
+
+def load_token_cache(cache_file_path=TOKEN_CACHE_FILE):
+    """
+    Loads persisted tokens ({"username@ip": {"token": ..., "expires_at": ...}}).
+    The file is only a cache: expired, malformed or unreadable content is discarded.
+    """
+    try:
+        with open(cache_file_path, 'r') as f:
+            token_cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(token_cache, dict):
+        return {}
+    now = time.time()
+    return {key: entry for key, entry in token_cache.items() if _is_valid_token_entry(entry, now)}
+
+def save_token_cache(token_cache, cache_file_path=TOKEN_CACHE_FILE):
+    """Persists tokens to a file readable only by the current user."""
+    try:
+        os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+        fd = os.open(cache_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(token_cache, f)
+        os.chmod(cache_file_path, 0o600)
+    except OSError as e:
+        print(f"Warning: Could not save token cache file {cache_file_path}: {e}")
+
 # --- API Interaction Functions ---
-def get_token(catalyst_center_ip, username, password):
-    """Obtains an authentication token from Cisco Catalyst Center."""
+def create_ssl_context():
+    """Creates the TLS context shared by all HTTP clients; certificate checks are disabled for self-signed certificates (if applicable)."""
+    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+# Built once at startup instead of once per HTTP client
+SSL_CONTEXT = create_ssl_context()
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps an httpx transport and retries transient failures, with exponential backoff:
+    responses with a transient status code (waiting for Retry-After on 429/503 when the server sends it),
+    and, for GET requests, read timeouts and broken connections.
+    """
+
+    def __init__(self, transport, total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF_FACTOR, status_codes=RETRY_STATUS_CODES):
+        self.transport = transport
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.status_codes = status_codes
+
+    def backoff(self, attempt):
+        return self.backoff_factor * (2 ** attempt)
+
+    def retry_after(self, response):
+        """Returns the Retry-After delay in seconds (capped), or None when the header is absent or invalid."""
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0), RETRY_AFTER_MAX_SECONDS)
+
+    async def handle_async_request(self, request):
+        for attempt in range(self.total + 1):
+            try:
+                response = await self.transport.handle_async_request(request)
+                # Read the body here so a timeout while receiving it is retried as well
+                await response.aread()
+            except (httpx.ReadTimeout, httpx.RemoteProtocolError):
+                # Only GET is safe to resend when the server may already have acted on the request
+                if request.method != 'GET' or attempt == self.total:
+                    raise
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+            if response.status_code not in self.status_codes or attempt == self.total:
+                return response
+            delay = self.retry_after(response) if response.status_code in RETRY_AFTER_STATUS_CODES else None
+            await response.aclose()
+            await asyncio.sleep(self.backoff(attempt) if delay is None else delay)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+async def resolve_address(host, port=443):
+    """
+    Resolves a Catalyst Center host name once, preferring IPv4.
+    Returns None for IP addresses (nothing to resolve) or when the lookup fails.
+    """
+    try:
+        ipaddress.ip_address(host)
+        return None
+    except ValueError:
+        pass
+    try:
+        address_infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        print(f"Warning: Could not resolve '{host}' up front, leaving it to the HTTP client: {e}")
+        return None
+    address_infos.sort(key=lambda address_info: address_info[0] != socket.AF_INET)
+    return address_infos[0][4][0]
+
+def pin_address_hook(host, address):
+    """Returns a request hook that sends requests for host to a pre-resolved address, skipping DNS on every new connection."""
+    async def pin_address(request):
+        if request.url.host == host:
+            # The Host header was already set from the original URL; keep the name for TLS SNI as well
+            request.extensions['sni_hostname'] = host
+            request.extensions['original_url'] = request.url
+            request.url = request.url.copy_with(host=address)
+    return pin_address
+
+def format_api_error(e):
+    """Formats an httpx error for output, showing the configured Catalyst Center URL rather than a pinned address."""
+    message = str(e)
+    try:
+        request = e.request
+    except RuntimeError:
+        return message
+    original_url = request.extensions.get('original_url')
+    if original_url is not None:
+        message = message.replace(str(request.url), str(original_url))
+    return message
+
+async def create_session(max_workers=MAX_WORKERS, host=None):
+    """
+    Creates an httpx AsyncClient that keeps connections to a Catalyst Center alive between calls.
+    Over HTTP/2 concurrent calls are multiplexed on a single TLS connection; otherwise at most
+    max_workers connections are opened. The number of requests in flight is capped separately
+    in call_with_reauth.
+    When host is a DNS name it is resolved once here and every request is pinned to that address.
+    """
+    limits = httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers)
+    # retries= covers failed connection attempts, RetryTransport covers 429/5xx responses
+    transport = httpx.AsyncHTTPTransport(http2=HTTP2_ENABLED, verify=SSL_CONTEXT, limits=limits, retries=RETRY_TOTAL)
+    # httpx already sends Accept-Encoding for every decoder it has (gzip, deflate, and br/zstd
+    # when brotli/zstandard are installed) and decompresses the large JSON lists transparently
+    headers = {
+        'Content-Type': 'application/json'
+    }
+    event_hooks = {}
+    if host:
+        # The configured 'ip' may carry a port; only the host part is resolved
+        hostname = httpx.URL(f"https://{host}").host
+        address = await resolve_address(hostname)
+        if address:
+            event_hooks['request'] = [pin_address_hook(hostname, address)]
+    # The timeout is raised from httpx's 5 second default as full inventories can take a while
+    return httpx.AsyncClient(transport=RetryTransport(transport), headers=headers, timeout=60.0, event_hooks=event_hooks)
+
+async def get_token(session, catalyst_center_ip, username, password):
+    """Obtains an authentication token from Cisco Catalyst Center and stores it on the session."""
     url = f"https://{catalyst_center_ip}/api/system/v1/auth/token"
-    response = requests.post(url, auth=HTTPBasicAuth(username, password), verify=False)
+    response = await session.post(url, auth=(username, password))
     response.raise_for_status()
-    return response.json()['Token']
-
-def get_device_id(token, catalyst_center_ip, device_name):
-    """Retrieves the device ID for a given device name."""
+    token = json_loads(response.content)['Token']
+    session.headers['X-Auth-Token'] = token
+    return token
+
+# Serializes re-authentication per DNA Center when concurrent calls hit an expired token
+_reauth_locks = {}
+# Caps concurrent API requests per DNA Center; HTTP/2 would otherwise send every call at once.
+# Filled by main() with one semaphore of --max-workers slots per DNA Center.
+_request_slots = {}
+
+async def refresh_token(session, token_cache, dna_center_details):
+    """Obtains a new token for a DNA Center and records it in the persistent token cache."""
+    catalyst_center_ip = dna_center_details.ip
+    token = await get_token(session, catalyst_center_ip, dna_center_details.username, dna_center_details.password)
+    token_cache[token_cache_key(dna_center_details)] = {"token": token, "expires_at": time.time() + TOKEN_TTL_SECONDS}
+    save_token_cache(token_cache)
+    return token
+
+async def call_with_reauth(session, token_cache, dna_center_details, api_call, *args):
+    """Runs an API call against a DNA Center; on HTTP 401 re-authenticates once and retries it."""
+    catalyst_center_ip = dna_center_details.ip
+    request_slots = _request_slots[catalyst_center_ip]
+    stale_token = session.headers.get('X-Auth-Token')
+    try:
+        async with request_slots:
+            return await api_call(session, catalyst_center_ip, *args)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 401:
+            raise
+    async with _reauth_locks.setdefault(catalyst_center_ip, asyncio.Lock()):
+        # Another call may already have refreshed the token while we waited
+        if session.headers.get('X-Auth-Token') == stale_token:
+            print(f"Token rejected by DNA Center '{dna_center_details.name}' ({catalyst_center_ip}), re-authenticating.")
+            token_cache.pop(token_cache_key(dna_center_details), None)
+            await refresh_token(session, token_cache, dna_center_details)
+    async with request_slots:
+        return await api_call(session, catalyst_center_ip, *args)
+
+async def get_device_inventory(session, catalyst_center_ip):
+    """Retrieves the full device inventory once and indexes device IDs by lowercase hostname."""
     url = f"https://{catalyst_center_ip}/dna/intent/api/v1/networkDevices"
-    headers = {'X-Auth-Token': token}
-    response = requests.get(url, headers=headers, verify=False)
+    response = await session.get(url)
     response.raise_for_status()
-    devices = response.json().get('response', [])
-    for device in devices:
-        if device.get('hostname', '').lower() == device_name.lower():
-            return device.get('id')
-    return None
-
-def get_interface_id_and_status(token, catalyst_center_ip, device_id, interface_name):
-    """Retrieves the interface ID and operational status for a given interface name on a device."""
-    # This endpoint '/interface/network-device/{device_id}/interface-name' with query_params 'name'
-    # is often less reliable than fetching all interfaces for a device and filtering locally.
-    # Reverting to the more robust approach used previously.
-    query_params = {
-        'name': interface_name
-    }
-    # Fetch all interfaces for the device
-    url = f"https://{catalyst_center_ip}/dna/intent/api/v1/interface/network-device/{device_id}/interface-name"
-    headers = {'X-Auth-Token': token}
-    response = requests.get(url, headers=headers,  params=query_params, verify=False)
+    devices = json_loads(response.content).get('response', [])
+    # Devices that are not fully discovered can report no hostname; they cannot be matched by name
+    return {device['hostname'].lower(): device['id'] for device in devices if device.get('hostname')}
+
+def get_device_id(device_id_cache, catalyst_center_ip, device_name):
+    """Looks up the device ID for a given device name in the cached inventory of a DNA Center."""
+    return device_id_cache[catalyst_center_ip].get(device_name.lower())
+
+async def get_all_interfaces(session, catalyst_center_ip, device_id):
+    """Retrieves all interfaces of a device in one call, indexed by lowercase name as (interface ID, operational status)."""
+    url = f"https://{catalyst_center_ip}/dna/intent/api/v1/interface/network-device/{device_id}"
+    response = await session.get(url)
     response.raise_for_status()
-    iface = response.json().get('response', [])
-    return iface.get('instanceUuid'), iface.get('status') # 'instanceUuid' is the ID, 'status' is operStatus
+    interfaces = json_loads(response.content).get('response', [])
+    # 'instanceUuid' is the ID, 'status' is operStatus
+    return {
+        iface['portName'].lower(): (iface.get('instanceUuid'), iface.get('status'))
+        for iface in interfaces if iface.get('portName')
+    }
+
 
+# (catalyst_center_ip, interface_id) -> (tx_util, rx_util)
+_utilization_cache = TTLCache(maxsize=4096, ttl=UTILIZATION_CACHE_TTL_SECONDS)
+
+async def get_interface_utilization(session, catalyst_center_ip, interface_id):
+    """Retrieves Rx and Tx utilization for a given interface ID, reusing results younger than the cache TTL."""
+    # cachetools.cached would cache the coroutine object rather than its result, so look up by hand
+    cache_key = (catalyst_center_ip, interface_id)
+    if cache_key in _utilization_cache:
+        return _utilization_cache[cache_key]
 
-def get_interface_utilization(token, catalyst_center_ip, interface_id):
-    """Retrieves Rx and Tx utilization for a given interface ID."""
     url = f"https://{catalyst_center_ip}/dna/data/api/v1/interfaces/{interface_id}"
     params = {
         'view': 'statistics'
     }
-    headers = {
-        'X-Auth-Token': token,
-        'Content-Type': 'application/json'
-    }
-    response = requests.get(url, headers=headers, params=params, verify=False)
+    response = await session.get(url, params=params)
     response.raise_for_status()
-    data = response.json()
+    data = json_loads(response.content)
 
     tx_util = None
     rx_util = None
@@ -86,42 +367,197 @@ def get_interface_utilization(token, catalyst_center_ip, interface_id):
         interface_stats = data.get('response')
         tx_util = interface_stats.get('txUtilization')
         rx_util = interface_stats.get('rxUtilization')
+    _utilization_cache[cache_key] = (tx_util, rx_util)
     return tx_util, rx_util
 
-def initialize_excel_report(filename):
+def initialize_csv_report(filename):
     """
-    Initializes a NEW Excel workbook with headers.
+    Initializes a NEW CSV report with headers and returns the open file and its writer.
     This function will always create a new file, overwriting any existing one.
     """
-    headers = ["DNA Center", "Device Name", "Interface Name", "Interface Status", "Tx Utilization (%)", "Rx Utilization (%)"]
-    workbook = openpyxl.Workbook()
-    sheet = workbook.active
-    sheet.title = "Interface Utilization"
-    sheet.append(headers)
-    workbook.save(filename)
-    print(f"Created a new Excel report: {filename}")
-
-def append_to_excel_report(data_row, filename):
-    """Appends a single row of data to the Excel report."""
+    csv_file = open(filename, 'w', newline='')
+    writer = csv.writer(csv_file)
+    writer.writerow(REPORT_HEADERS)
+    print(f"Created a new CSV report: {filename}")
+    return csv_file, writer
+
+def append_to_csv_report(data_row, writer):
+    """Appends a single row of data to the CSV report."""
     try:
-        workbook = openpyxl.load_workbook(filename)
-        sheet = workbook.active
-        sheet.append(data_row)
-        workbook.save(filename)
+        writer.writerow(data_row)
     except Exception as e:
-        print(f"Error appending data to Excel file {filename}: {e}")
+        print(f"Error appending data to CSV report: {e}")
 
-def main():
+def write_excel_report(report_rows, filename):
+    """
+    Writes all collected report rows to a NEW Excel workbook in a single pass.
+    This function will always create a new file, overwriting any existing one.
+    """
+    try:
+        report = pd.DataFrame(report_rows, columns=REPORT_HEADERS)
+        report.to_excel(filename, sheet_name="Interface Utilization", engine="xlsxwriter", index=False)
+        print(f"Created a new Excel report: {filename}")
+    except Exception as e:
+        print(f"Error writing Excel file {filename}: {e}")
+
+# --- Processing Functions ---
+async def with_index(index, coroutine):
+    """Awaits a coroutine and returns its result together with index, to restore order after asyncio.as_completed."""
+    return index, await coroutine
+
+async def process_interface(session, token_cache, dna_center_details, device_name, device_interfaces, interface_name):
+    """
+    Resolves one interface of a device and fetches its utilization, returning its report row.
+    API errors are reported on the row instead of raised, so the interfaces of a device can be gathered together.
+    """
+    dna_center_name = dna_center_details.name
+    print(f"  Querying Interface: '{interface_name}' on device '{device_name}'")
+    interface_id, oper_status = device_interfaces.get(interface_name.lower(), (None, None))
+    if not interface_id:
+        print(f"  Error: Interface '{interface_name}' not found on device '{device_name}'.")
+        # Row indicating the interface was not found
+        return [
+            dna_center_name,
+            device_name,
+            interface_name,
+            "Interface Not Found",
+            "N/A",
+            "N/A"
+        ]
+
+    print(f"    Interface ID for '{device_name}' '{interface_name}': {interface_id}")
+    print(f"    Interface Operational Status for '{device_name}' '{interface_name}': {oper_status}")
+
+    try:
+        tx_utilization, rx_utilization = await call_with_reauth(session, token_cache, dna_center_details, get_interface_utilization, interface_id)
+    except httpx.HTTPError as e:
+        # Keep the failure on this interface's row so the other interfaces of the device are still reported
+        error_message = format_api_error(e)
+        print(f"  Network or API Error for interface '{interface_name}' on device '{device_name}': {error_message}")
+        return [
+            dna_center_name,
+            device_name,
+            interface_name,
+            f"API Error: {error_message}",
+            "N/A",
+            "N/A"
+        ]
+    except ValueError as e:
+        # A 200 response that is not JSON (e.g. a proxy or login page) only fails this interface too
+        print(f"  Invalid API response for interface '{interface_name}' on device '{device_name}': {e}")
+        return [
+            dna_center_name,
+            device_name,
+            interface_name,
+            f"Invalid API Response: {e}",
+            "N/A",
+            "N/A"
+        ]
+    print(f"    Tx utilization for '{device_name}' '{interface_name}': {tx_utilization}")
+    print(f"    Rx utilization for '{device_name}' '{interface_name}': {rx_utilization}")
+
+    return [
+        dna_center_name,
+        device_name,
+        interface_name,
+        oper_status,
+        tx_utilization,
+        rx_utilization
+    ]
+
+async def process_device(session, token_cache, dna_center_details, device_id_cache, device_entry):
+    """Queries all configured interfaces of one device concurrently and returns their report rows."""
+    dna_center_name = dna_center_details.name
+    device_name = device_entry.device_name
+    interfaces_to_process = device_entry.interfaces
+
+    print(f"\nProcessing Device: '{device_name}' on DNA Center: '{dna_center_name}'")
+
+    try:
+        device_id = get_device_id(device_id_cache, dna_center_details.ip, device_name)
+        if not device_id:
+            print(f"Error: Device '{device_name}' not found on DNA Center '{dna_center_name}'. Skipping its interfaces.")
+            # Log error to Excel
+            return [[
+                dna_center_name,
+                device_name,
+                "N/A",
+                "Device Not Found",
+                "N/A",
+                "N/A"
+            ]]
+        print(f"Device ID for '{device_name}': {device_id}")
+
+        # Fetch all interfaces of the device once and look up the requested ones locally
+        device_interfaces = await call_with_reauth(session, token_cache, dna_center_details, get_all_interfaces, device_id)
+
+        # Query every interface of the current device concurrently
+        return await asyncio.gather(*(
+            process_interface(session, token_cache, dna_center_details, device_name, device_interfaces, interface_name)
+            for interface_name in interfaces_to_process
+        ))
+
+    except httpx.HTTPError as e:
+        error_message = format_api_error(e)
+        print(f"Network or API Error for device '{device_name}' on '{dna_center_name}': {error_message}")
+        if isinstance(e, httpx.HTTPStatusError):
+            print(f"    Response Status Code: {e.response.status_code}")
+            print(f"    Response Body: {e.response.text}")
+        # Log error to Excel as well
+        return [[
+            dna_center_name,
+            device_name,
+            "N/A", # Interface name not known at this point of error
+            f"API Error: {error_message}",
+            "N/A",
+            "N/A"
+        ]]
+    except Exception as e:
+        print(f"An unexpected error occurred for device '{device_name}' on '{dna_center_name}': {e}")
+        # Log error to Excel as well
+        return [[
+            dna_center_name,
+            device_name,
+            "N/A", # Interface name not known at this point of error
+            f"Unexpected Error: {e}",
+            "N/A",
+            "N/A"
+        ]]
+
+def positive_int(value):
+    """argparse type for options that need a whole number of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+async def main():
     parser = argparse.ArgumentParser(description="Fetch Cisco Catalyst Center interface utilization and export to Excel.")
     parser.add_argument("--config", default="INT UTILIZATION.yaml", help="Path to the YAML configuration file.")
+    parser.add_argument("--max-workers", type=positive_int, default=MAX_WORKERS, help="Maximum number of concurrent API requests per DNA Center.")
     args = parser.parse_args()
 
+    # pandas only imports its Excel engine when writing; check for it before doing any API work
+    if importlib.util.find_spec("xlsxwriter") is None:
+        print("Error: The 'xlsxwriter' package is required to write the Excel report (pip install xlsxwriter).")
+        return
+
+    # One HTTP session per DNA Center so TCP/TLS connections are reused across API calls
+    session_cache = {}
+    # CSV report, created once the configuration is valid
+    csv_file = None
+    # Report rows of each finished device, keyed by its position in the configuration, for the Excel report
+    device_results = {}
+
     try:
         config = load_config(args.config)
 
         # Create a dictionary for quick lookup of DNA Center details by name
-        dna_centers_config = {dc['name']: dc for dc in config.get('dna_centers', [])}
-        targets = config.get('targets', [])
+        dna_centers_config = {dc.name: dc for dc in config.dna_centers}
+        targets = config.targets
 
         if not dna_centers_config:
             print("Error: No 'dna_centers' defined in config.yaml. Please define at least one DNA Center.")
@@ -130,145 +566,79 @@ def main():
             print("Warning: No 'targets' defined in config.yaml. Nothing to process.")
             return
 
-        # Initialize Excel report - this will now always create a new one with a unique name
-        initialize_excel_report(EXCEL_FILENAME)
+        # Initialize report - this will now always create a new one with a unique name
+        csv_file, writer = initialize_csv_report(CSV_FILENAME)
 
-        # Token caching to avoid re-authenticating repeatedly for the same DNA Center
-        token_cache = {}
+        # Tokens persisted across runs to avoid re-authenticating repeatedly for the same DNA Center
+        token_cache = load_token_cache()
+        # Device inventory per DNA Center ({hostname_lower: id}), fetched once instead of once per device
+        device_id_cache = {}
+        # Device coroutines from every target group, run concurrently once all tokens are obtained
+        device_tasks = []
 
         # Iterate through each target group defined in the YAML
         for target_group in targets:
-            dna_center_name = target_group.get('dna_center_name')
-            devices_to_process = target_group.get('devices', [])
-
-            if not dna_center_name:
-                print(f"Skipping target group due to missing 'dna_center_name': {target_group}")
-                continue
+            dna_center_name = target_group.dna_center_name
+            devices_to_process = target_group.devices
 
             dna_center_details = dna_centers_config.get(dna_center_name)
             if not dna_center_details:
                 print(f"Error: DNA Center '{dna_center_name}' not found in 'dna_centers' configuration for target group. Skipping.")
                 continue
 
-            CATALYST_CENTER_IP = dna_center_details['ip']
-            USERNAME = dna_center_details['username']
-            PASSWORD = dna_center_details['password']
+            CATALYST_CENTER_IP = dna_center_details.ip
+
+            if CATALYST_CENTER_IP not in session_cache:
+                session_cache[CATALYST_CENTER_IP] = await create_session(args.max_workers, CATALYST_CENTER_IP)
+                _request_slots[CATALYST_CENTER_IP] = asyncio.Semaphore(args.max_workers)
+            session = session_cache[CATALYST_CENTER_IP]
 
-            # Get token once per DNA Center, or use cached token
-            if CATALYST_CENTER_IP not in token_cache:
+            # Get token once per DNA Center, or use a cached token that has not expired yet
+            cached_token = token_cache.get(token_cache_key(dna_center_details))
+            if cached_token and cached_token['expires_at'] > time.time():
+                session.headers['X-Auth-Token'] = cached_token['token']
+                print(f"\n--- Using cached token for DNA Center: '{dna_center_name}' ({CATALYST_CENTER_IP}) ---")
+            else:
                 try:
-                    token = get_token(CATALYST_CENTER_IP, USERNAME, PASSWORD)
-                    token_cache[CATALYST_CENTER_IP] = token
+                    await refresh_token(session, token_cache, dna_center_details)
                     print(f"\n--- Obtained token for DNA Center: '{dna_center_name}' ({CATALYST_CENTER_IP}) ---")
-                except requests.exceptions.RequestException as e:
-                    print(f"Error getting token for DNA Center '{dna_center_name}': {e}")
+                except httpx.HTTPError as e:
+                    print(f"Error getting token for DNA Center '{dna_center_name}': {format_api_error(e)}")
                     continue
-            else:
-                token = token_cache[CATALYST_CENTER_IP]
-                print(f"\n--- Using cached token for DNA Center: '{dna_center_name}' ({CATALYST_CENTER_IP}) ---")
 
-            # Iterate through each device within the current target group
-            for device_entry in devices_to_process:
-                device_name = device_entry.get('device_name')
-                interfaces_to_process = device_entry.get('interfaces')
-
-                if not device_name:
-                    print(f"Skipping device entry due to missing 'device_name': {device_entry}")
+            # Get device inventory once per DNA Center
+            if CATALYST_CENTER_IP not in device_id_cache:
+                try:
+                    device_id_cache[CATALYST_CENTER_IP] = await call_with_reauth(session, token_cache, dna_center_details, get_device_inventory)
+                except httpx.HTTPError as e:
+                    print(f"Error getting device inventory for DNA Center '{dna_center_name}': {format_api_error(e)}")
                     continue
 
-                print(f"\nProcessing Device: '{device_name}' on DNA Center: '{dna_center_name}'")
+            for device_entry in devices_to_process:
+                device_tasks.append(process_device(session, token_cache, dna_center_details, device_id_cache, device_entry))
 
-                try:
-                    device_id = get_device_id(token, CATALYST_CENTER_IP, device_name)
-                    if not device_id:
-                        print(f"Error: Device '{device_name}' not found on DNA Center '{dna_center_name}'. Skipping its interfaces.")
-                        # Log error to Excel
-                        excel_data = [
-                            dna_center_name,
-                            device_name,
-                            "N/A",
-                            "Device Not Found",
-                            "N/A",
-                            "N/A"
-                        ]
-                        append_to_excel_report(excel_data, EXCEL_FILENAME)
-                        continue
-                    print(f"Device ID for '{device_name}': {device_id}")
-
-                    # Iterate through each interface for the current device
-                    for interface_name in interfaces_to_process:
-                        print(f"  Querying Interface: '{interface_name}'")
-                        interface_id, oper_status = get_interface_id_and_status(token, CATALYST_CENTER_IP, device_id, interface_name)
-                        if not interface_id:
-                            print(f"  Error: Interface '{interface_name}' not found on device '{device_name}'.")
-                            # Append a row indicating the interface was not found
-                            excel_data = [
-                                dna_center_name,
-                                device_name,
-                                interface_name,
-                                "Interface Not Found",
-                                "N/A",
-                                "N/A"
-                            ]
-                            append_to_excel_report(excel_data, EXCEL_FILENAME)
-                            continue
-
-                        print(f"    Interface ID: {interface_id}")
-                        print(f"    Interface Operational Status: {oper_status}")
-
-                        tx_utilization, rx_utilization = get_interface_utilization(token, CATALYST_CENTER_IP, interface_id)
-                        print(f"    Tx utilization: {tx_utilization}")
-                        print(f"    Rx utilization: {rx_utilization}")
-
-                        # Prepare data for Excel
-                        excel_data = [
-                            dna_center_name,
-                            device_name,
-                            interface_name,
-                            oper_status,
-                            tx_utilization,
-                            rx_utilization
-                        ]
-
-                        # Export to Excel
-                        append_to_excel_report(excel_data, EXCEL_FILENAME)
-
-                except requests.exceptions.RequestException as e:
-                    print(f"Network or API Error for device '{device_name}' on '{dna_center_name}': {e}")
-                    if e.response is not None:
-                        print(f"    Response Status Code: {e.response.status_code}")
-                        print(f"    Response Body: {e.response.text}")
-                    # Log error to Excel as well
-                    excel_data = [
-                        dna_center_name,
-                        device_name,
-                        "N/A", # Interface name not known at this point of error
-                        f"API Error: {e}",
-                        "N/A",
-                        "N/A"
-                    ]
-                    append_to_excel_report(excel_data, EXCEL_FILENAME)
-                except Exception as e:
-                    print(f"An unexpected error occurred for device '{device_name}' on '{dna_center_name}': {e}")
-                    # Log error to Excel as well
-                    excel_data = [
-                        dna_center_name,
-                        device_name,
-                        "N/A", # Interface name not known at this point of error
-                        f"Unexpected Error: {e}",
-                        "N/A",
-                        "N/A"
-                    ]
-                    append_to_excel_report(excel_data, EXCEL_FILENAME)
+        # Process all devices concurrently; each device's rows reach the CSV as soon as it finishes
+        for finished in asyncio.as_completed([with_index(index, task) for index, task in enumerate(device_tasks)]):
+            index, device_rows = await finished
+            for excel_data in device_rows:
+                append_to_csv_report(excel_data, writer)
+            csv_file.flush()
+            device_results[index] = device_rows
 
     except FileNotFoundError as e:
         print(f"Configuration Error: {e}")
     except ValueError as e:
         print(f"Configuration Error: {e}")
-    except KeyError as e:
-        print(f"Configuration Error: Missing key in config.yaml: {e}. Please ensure all required fields are present.")
     except Exception as e:
         print(f"An unexpected error occurred during script execution: {e}")
+    finally:
+        for session in session_cache.values():
+            await session.aclose()
+        if csv_file is not None:
+            csv_file.close()
+            # The Excel report lists devices in configuration order, including after a partial run
+            report_rows = [row for index in sorted(device_results) for row in device_results[index]]
+            write_excel_report(report_rows, EXCEL_FILENAME)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,20 @@
+import pytest
+
+import main
+
+
+def test_validation_error_does_not_reveal_password(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(
+        "dna_centers:\n"
+        "  - name: P\n"
+        "    ip: 10.1.1.1\n"
+        "    password: S3cretPassw0rd\n"
+        "targets: []\n"
+    )
+
+    with pytest.raises(ValueError) as excinfo:
+        main.load_config(str(config_file))
+
+    assert "username" in str(excinfo.value)
+    assert "S3cretPassw0rd" not in str(excinfo.value)
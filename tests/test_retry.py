@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+import pytest
+
+import main
+
+
+def send(monkeypatch, handler, method="GET", delays=None):
+    """Sends one request through a RetryTransport wrapping handler, recording the backoff sleeps."""
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(main.asyncio, "sleep", fake_sleep)
+
+    async def run():
+        client = httpx.AsyncClient(transport=main.RetryTransport(httpx.MockTransport(handler)))
+        async with client:
+            return await client.request(method, "https://dnac.example/api")
+
+    return asyncio.run(run())
+
+
+def test_429_waits_for_retry_after(monkeypatch):
+    responses = iter([httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200, json={})])
+    delays = []
+    response = send(monkeypatch, lambda request: next(responses), delays=delays)
+    assert response.status_code == 200
+    assert delays == [7.0]
+
+
+def test_retry_after_is_capped(monkeypatch):
+    responses = iter([httpx.Response(503, headers={"Retry-After": "3600"}), httpx.Response(200, json={})])
+    delays = []
+    send(monkeypatch, lambda request: next(responses), delays=delays)
+    assert delays == [main.RETRY_AFTER_MAX_SECONDS]
+
+
+def test_read_timeout_is_retried_for_get(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200, json={})
+
+    delays = []
+    assert send(monkeypatch, handler, delays=delays).status_code == 200
+    assert delays == [main.RETRY_BACKOFF_FACTOR, main.RETRY_BACKOFF_FACTOR * 2]
+
+
+def test_read_timeout_is_not_retried_for_post(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    with pytest.raises(httpx.ReadTimeout):
+        send(monkeypatch, handler, method="POST", delays=[])
+    assert len(calls) == 1